@@ -130,6 +130,21 @@ def jinja_filter_param_value_str(value, str_quote_style="", bool_is_str=False):
         return str(value)
 
 
+# Template environment shared between backend instances. Templates looked up
+# here are compiled once per process. It only carries the default filters, so
+# backends that register their own filters on self.jinja_env can't use it.
+_shared_jinja_env = Environment(
+    loader=PackageLoader(__package__, "templates"),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+    auto_reload=False,
+    cache_size=-1,
+)
+_shared_jinja_env.filters["param_value_str"] = jinja_filter_param_value_str
+_shared_jinja_env.filters["generic_value_str"] = jinja_filter_param_value_str
+
+
 class FileAction(argparse.Action):
     def __call__(self, parser, namespace, values, option_string=None):
         path = os.path.expandvars(values[0])
@@ -139,6 +154,10 @@ class FileAction(argparse.Action):
 
 
 class Edatool(object):
+    # Backends that don't add filters to self.jinja_env can set this to have
+    # their compiled templates cached on the class instead of per instance
+    _shared_templates = False
+
     def __init__(self, edam=None, work_root=None, eda_api=None, verbose=True):
         _tool_name = self.__class__.__name__.lower()
 
@@ -386,12 +405,36 @@ class Edatool(object):
 
         The template file is expected in the directory templates/BACKEND_NAME.
         """
-        template_dir = str(self.__class__.__name__).lower()
-        template = self.jinja_env.get_template("/".join([template_dir, template_file]))
+        if self._shared_templates:
+            template = self._get_shared_template(template_file)
+        else:
+            template_dir = str(self.__class__.__name__).lower()
+            template = self.jinja_env.get_template(
+                "/".join([template_dir, template_file])
+            )
         file_path = os.path.join(self.work_root, target_file)
         with open(file_path, "w") as f:
             f.write(template.render(template_vars))
 
+    @classmethod
+    def _get_shared_template(cls, template_file):
+        """
+        Get a compiled template from the shared environment.
+
+        Templates are cached per backend class so that creating many instances
+        of the same backend only compiles each template once.
+        """
+        cache = cls.__dict__.get("_template_cache")
+        if cache is None:
+            cache = cls._template_cache = {}
+        template = cache.get(template_file)
+        if template is None:
+            template_dir = cls.__name__.lower()
+            template = cache[template_file] = _shared_jinja_env.get_template(
+                "/".join([template_dir, template_file])
+            )
+        return template
+
     def _add_include_dir(self, f, incdirs, force_slash=False):
         if f.get("is_include_file"):
             _incdir = f.get("include_path") or os.path.dirname(f["name"]) or "."
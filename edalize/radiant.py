@@ -3,16 +3,21 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import logging
-import os.path
 
 from edalize.edatool import Edatool
 from edalize.utils import get_file_type
 
 logger = logging.getLogger(__name__)
 
+# File types that are added to the project with prj_add_source
+_PRJ_ADD_SOURCE_TYPES = frozenset(
+    ["verilogSource", "systemVerilogSource", "vhdlSource", "PDC", "SDC"]
+)
+
 
 class Radiant(Edatool):
     argtypes = ["generic", "vlogdefine", "vlogparam"]
+    _shared_templates = True
 
     @classmethod
     def get_doc(cls, api_ver):
@@ -29,96 +34,56 @@ class Radiant(Edatool):
             }
 
     def configure_main(self):
-        (src_files, incdirs) = self._get_fileset_files()
-        pdc_file = None
+        (src_files, incdirs, _) = self._get_fileset_files()
+        file_types = [get_file_type(f) for f in src_files]
         prj_name = self.name.replace(".", "_")
-        for f in src_files:
-            if f.file_type == "PDC":
-                if pdc_file:
-                    logger.warning(
-                        "Multiple PDC files detected. Only the first one will be used"
-                    )
-                else:
-                    pdc_file = f.name
-
-        with open(os.path.join(self.work_root, self.name + ".tcl"), "w") as f:
-            TCL_TEMPLATE = """#Generated by Edalize
-prj_create -name {} -impl "impl" -dev {}
-prj_set_impl_opt top {}
-"""
-            f.write(
-                TCL_TEMPLATE.format(
-                    prj_name,
-                    self.tool_options["part"],
-                    self.toplevel,
-                )
-            )
-            if incdirs:
-                _s = "prj_set_impl_opt {include path} {"
-                _s += " ".join(incdirs)
-                f.write(_s + "}\n")
-            if self.generic:  # ?
-                _s = ";".join(["{}={}".format(k, v) for k, v in self.generic.items()])
-                f.write("prj_set_impl_opt HDL_PARAM {")
-                f.write(_s)
-                f.write("}\n")
-            if self.vlogparam:
-                _s = ";".join(
-                    [
-                        "{}={}".format(k, self._param_value_str(v, '"'))
-                        for k, v in self.vlogparam.items()
-                    ]
-                )
-                f.write("prj_set_impl_opt HDL_PARAM {")
-                f.write(_s)
-                f.write("}\n")
-            if self.vlogdefine:
-                _s = ";".join(
-                    ["{}={}".format(k, v) for k, v in self.vlogdefine.items()]
-                )
-                f.write("prj_set_impl_opt VERILOG_DIRECTIVES {")
-                f.write(_s)
-                f.write("}\n")
-            for src_file in src_files:
-                _s = self.src_file_filter(src_file)
-                if _s:
-                    f.write(_s + "\n")
-            f.write("prj_save\nprj_close\n")
 
-        with open(os.path.join(self.work_root, self.name + "_run.tcl"), "w") as f:
-            f.write(
-                """#Generated by Edalize
-prj_open {}.rdf
-prj_run Synthesis -impl impl -forceOne
-prj_run Map -impl impl
-prj_run PAR -impl impl
-prj_run Export -impl impl -task Bitgen
-prj_save
-prj_close
-""".format(
-                    prj_name
-                )
+        # Stop looking once a second PDC file has been found
+        pdc_files = (
+            f.name for f, file_type in zip(src_files, file_types) if file_type == "PDC"
+        )
+        pdc_file = next(pdc_files, None)
+        if next(pdc_files, None) is not None:
+            logger.warning(
+                "Multiple PDC files detected. Only the first one will be used"
             )
 
-    def src_file_filter(self, f):
-        def _work_source(f):
-            s = " -work "
-            if f.logical_name:
-                s += f.logical_name
-            else:
-                s += "work"
-            return s
+        src_lines = [
+            _s for _s in map(self.src_file_filter, src_files, file_types) if _s
+        ]
 
-        file_types = {
-            "verilogSource": "prj_add_source ",
-            "systemVerilogSource": "prj_add_source ",
-            "vhdlSource": "prj_add_source ",
-            "PDC": "prj_add_source ",
-            "SDC": "prj_add_source ",
+        str_quote_style = '"'
+        template_vars = {
+            "name": self.name,
+            "prj_name": prj_name,
+            "part": self.tool_options["part"],
+            "toplevel": self.toplevel,
+            "incdirs": incdirs,
+            "generic": ";".join(f"{k}={v}" for k, v in self.generic.items()),
+            "vlogparam": ";".join(
+                f"{k}={self._param_value_str(v, str_quote_style)}"
+                for k, v in self.vlogparam.items()
+            ),
+            "vlogdefine": ";".join(f"{k}={v}" for k, v in self.vlogdefine.items()),
+            "src_lines": src_lines,
+            "op": "{",
+            "cl": "}",
         }
-        _file_type = get_file_type(f)
-        if _file_type in file_types:
-            return file_types[_file_type] + f.name + _work_source(f)
+
+        self.render_template(
+            "radiant-project.tcl.j2", self.name + ".tcl", template_vars
+        )
+        self.render_template(
+            "radiant-run.tcl.j2", self.name + "_run.tcl", template_vars
+        )
+        self.render_template(
+            "radiant-all.tcl.j2", self.name + "_all.tcl", template_vars
+        )
+
+    def src_file_filter(self, f, file_type=None):
+        _file_type = get_file_type(f) if file_type is None else file_type
+        if _file_type in _PRJ_ADD_SOURCE_TYPES:
+            return f"prj_add_source {f.name} -work {f.logical_name or 'work'}"
         elif _file_type == "tclSource":
             return "source " + f.name
         elif _file_type in ["user", "LPF"]:
@@ -129,8 +94,8 @@ prj_close
         return ""
 
     def build_main(self):
-        self._run_tool("radiantc", [self.name + ".tcl"], quiet=True)
-        self._run_tool("radiantc", [self.name + "_run.tcl"], quiet=True)
+        # Create and build the project in a single radiantc session
+        self._run_tool("radiantc", [self.name + "_all.tcl"], quiet=True)
 
     def run_main(self):
         pass
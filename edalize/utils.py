@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 class EdaCommands(object):
     class Command(object):
         def __init__(
@@ -44,48 +47,48 @@ class EdaCommands(object):
         self.default_target = target
 
     def write(self, outfile):
+        if not self.default_target:
+            raise RuntimeError("Internal Edalize error. Missing default target")
+
+        parts = [self.header]
+        for v in self.vars:
+            parts.append(v + "\n")
+        if self.vars:
+            parts.append("\n\n")
+
+        parts.append(f"all: {self.default_target}\n")
+
+        for c in self.commands:
+            line = f"\n{' '.join(c.targets)}:"
+            if c.depends:
+                line += " " + " ".join(c.depends)
+            if c.order_only_deps:
+                line += " | " + " ".join(c.order_only_deps)
+            parts.append(line + "\n")
+
+            env_prefix = ""
+            if c.variables:
+                env_prefix += "env "
+                for key, value in c.variables.items():
+                    env_prefix += f"{key}={value} "
+
+            for command in c.commands:
+                if command:
+                    parts.append(
+                        f"\t$(EDALIZE_LAUNCHER) {env_prefix}{' '.join([str(x) for x in command])}\n"
+                    )
+
         with open(outfile, "w") as f:
-            f.write(self.header)
-            for v in self.vars:
-                f.write(v + "\n")
-            if self.vars:
-                f.write("\n\n")
-            if not self.default_target:
-                raise RuntimeError("Internal Edalize error. Missing default target")
-
-            f.write(f"all: {self.default_target}\n")
-
-            for c in self.commands:
-                f.write(f"\n{' '.join(c.targets)}:")
-                for d in c.depends:
-                    f.write(" " + d)
-                if c.order_only_deps:
-                    f.write(" |")
-                    for d in c.order_only_deps:
-                        f.write(" " + d)
-
-                f.write("\n")
-
-                env_prefix = ""
-                if c.variables:
-                    env_prefix += "env "
-                    for key, value in c.variables.items():
-                        env_prefix += f"{key}={value} "
-
-                for command in c.commands:
-                    if command:
-                        f.write(
-                            f"\t$(EDALIZE_LAUNCHER) {env_prefix}{' '.join([str(x) for x in command])}\n"
-                        )
+            f.write("".join(parts))
 
 
 # Helper function to strip potential version from the end of a file_type (for example, converting
 # vhdlSource-2008 -> vhdlSource)
 def get_file_type(file_obj):
-    file_type = file_obj.file_type
+    return _strip_file_type_version(file_obj.file_type)
 
-    for i, c in enumerate(file_type):
-        if c == "-":
-            return file_type[0:i]
 
-    return file_type
+# There is only a handful of distinct file types, so cache the result per string
+@lru_cache(maxsize=None)
+def _strip_file_type_version(file_type):
+    return file_type.partition("-")[0]
@@ -3,53 +3,24 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import logging
-import os
 import logging
 
 from edalize.edatool import Edatool
+from edalize.utils import get_file_type
 
 logger = logging.getLogger(__name__)
 
-CONFIG_MK_TEMPLATE = """#Auto generated by Edalize
+# Source file types passed to verilator, other than vlt files
+_VLOG_FILE_TYPES = frozenset(["systemVerilogSource", "verilogSource"])
+_C_FILE_TYPES = frozenset(["cppSource", "systemCSource", "cSource"])
 
-TOP_MODULE        := {top_module}
-VC_FILE           := {vc_file}
-VERILATOR_OPTIONS := {verilator_options}
-MAKE_OPTIONS      := {make_options}
-"""
-
-MAKEFILE_TEMPLATE = """#Auto generated by Edalize
-
-include config.mk
-
-#Assume a local installation if VERILATOR_ROOT is set
-ifeq ($(VERILATOR_ROOT),)
-VERILATOR ?= verilator
-else
-VERILATOR ?= $(VERILATOR_ROOT)/bin/verilator
-endif
-
-V$(TOP_MODULE): V$(TOP_MODULE).mk
-	$(MAKE) $(MAKE_OPTIONS) -f $<
-V$(TOP_MODULE).mk:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) -f $(VC_FILE) $(VERILATOR_OPTIONS)
-
-.PHONY: binary dpi-hdr-only lint-only preprocess-only xml-only
-binary:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) --binary -f $(VC_FILE) $(VERILATOR_OPTIONS)
-dpi-hdr-only:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) --dpi-hdr-only -f $(VC_FILE) $(VERILATOR_OPTIONS)
-lint-only:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) --lint-only -f $(VC_FILE) $(VERILATOR_OPTIONS)
-preprocess-only V$(TOP_MODULE).i:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) -E -f $(VC_FILE) $(VERILATOR_OPTIONS) > V$(TOP_MODULE).i
-xml-only V$(TOP_MODULE).xml:
-	$(EDALIZE_LAUNCHER) $(VERILATOR) --xml-only -f $(VC_FILE) $(VERILATOR_OPTIONS)
-"""
+# Boolean tool options that are disabled unless set to true
+_BOOL_OPTS = ("gen-xml", "gen-dpi-hdr", "gen-preprocess")
 
 
 class Verilator(Edatool):
     argtypes = ["cmdlinearg", "plusarg", "vlogdefine", "vlogparam"]
+    _shared_templates = True
 
     modes = [
         "binary",
@@ -61,6 +32,7 @@ class Verilator(Edatool):
         "sc",
         "xml-only",
     ]
+    _MODES_SET = frozenset(modes)
 
     @classmethod
     def get_doc(cls, api_ver):
@@ -113,7 +85,7 @@ class Verilator(Edatool):
                     {
                         "name": "make_options",
                         "type": "String",
-                        "desc": "Additional arguments passed to make when compiling the simulation. This is commonly used to set OPT/OPT_FAST/OPT_SLOW.",
+                        "desc": "Additional arguments passed to make when compiling the simulation. This is commonly used to set OPT/OPT_FAST/OPT_SLOW. The model is compiled with one job per CPU unless MAKE_JOBS is set.",
                     },
                     {
                         "name": "run_options",
@@ -133,6 +105,37 @@ class Verilator(Edatool):
                 "The cli_parser argument is deprecated. Use run_options to pass raw arguments to verilated models"
             )
 
+    def _resolved_mode(self):
+        """
+        Return the verilator mode, defaulting to cc if not specified.
+
+        The mode is validated on first use and cached for later calls.
+        """
+        mode = getattr(self, "_mode", None)
+        if mode is None:
+            mode = self.tool_options.setdefault("mode", "cc")
+            if mode not in Verilator._MODES_SET:
+                _s = "Illegal verilator mode {}. Allowed values are {}"
+                raise RuntimeError(_s.format(mode, ", ".join(Verilator.modes)))
+            self._mode = mode
+        return mode
+
+    def _get_bool_opts(self):
+        """
+        Return a dict with the boolean tool options resolved to True/False.
+
+        exe is enabled unless explicitly set to false, the others are
+        disabled unless set to true.
+        """
+        bool_opts = getattr(self, "_bool_opts", None)
+        if bool_opts is None:
+            bool_opts = {
+                k: str(self.tool_options.get(k)).lower() == "true" for k in _BOOL_OPTS
+            }
+            bool_opts["exe"] = str(self.tool_options.get("exe")).lower() != "false"
+            self._bool_opts = bool_opts
+        return bool_opts
+
     def configure_main(self):
         logger.warning(
             "This backend is deprecated and will eventually be removed. Please migrate to the flow API instead.  See https://edalize.readthedocs.io/en/latest/ref/migrations.html#migrating-from-the-tool-api-to-the-flow-api for more details."
@@ -147,77 +150,38 @@ class Verilator(Edatool):
 
     def _write_config_files(self):
         # Future improvement: Separate include directories of c and verilog files
-        incdirs = set()
-        src_files = []
-
-        (src_files, incdirs) = self._get_fileset_files(force_slash=True)
+        (src_files, incdirs, _) = self._get_fileset_files(force_slash=True)
 
         self.verilator_file = self.name + ".vc"
 
-        with open(os.path.join(self.work_root, self.verilator_file), "w") as f:
-            f.write("--Mdir .\n")
-
-            # Default to cc mode if not specified
-            if "mode" not in self.tool_options:
-                self.tool_options["mode"] = "cc"
-
-            if self.tool_options["mode"] not in Verilator.modes:
-                _s = "Illegal verilator mode {}. Allowed values are {}"
-                raise RuntimeError(
-                    _s.format(self.tool_options["mode"], ", ".join(Verilator.modes))
-                )
-            if self.tool_options["mode"] in ["cc", "sc"]:
-                f.write("--" + self.tool_options["mode"] + "\n")
-            if "libs" in self.tool_options:
-                for lib in self.tool_options["libs"]:
-                    f.write("-LDFLAGS {}\n".format(lib))
-            for include_dir in incdirs:
-                f.write("+incdir+" + include_dir + "\n")
-                f.write("-CFLAGS -I{}\n".format(include_dir))
-            vlt_files = []
-            vlog_files = []
-            opt_c_files = []
-            for src_file in src_files:
-                if src_file.file_type.startswith(
-                    "systemVerilogSource"
-                ) or src_file.file_type.startswith("verilogSource"):
-                    vlog_files.append(src_file.name)
-                elif src_file.file_type in ["cppSource", "systemCSource", "cSource"]:
-                    opt_c_files.append(src_file.name)
-                elif src_file.file_type == "vlt":
-                    vlt_files.append(src_file.name)
-                elif src_file.file_type == "user":
-                    pass
-
-            if vlt_files:
-                f.write("\n".join(vlt_files) + "\n")
-            f.write("\n".join(vlog_files) + "\n")
-            f.write("--top-module {}\n".format(self.toplevel))
-            if str(self.tool_options.get("exe")).lower() != "false":
-                f.write("--exe\n")
-            f.write("\n".join(opt_c_files))
-            f.write("\n")
-            f.write(
-                "".join(
-                    [
-                        "-G{}={}\n".format(
-                            key, self._param_value_str(value, str_quote_style='\\"')
-                        )
-                        for key, value in self.vlogparam.items()
-                    ]
-                )
-            )
-            f.write(
-                "".join(
-                    [
-                        "-D{}={}\n".format(key, self._param_value_str(value))
-                        for key, value in self.vlogdefine.items()
-                    ]
-                )
-            )
-
-        with open(os.path.join(self.work_root, "Makefile"), "w") as makefile:
-            makefile.write(MAKEFILE_TEMPLATE)
+        vlt_files = []
+        vlog_files = []
+        opt_c_files = []
+        file_types = [get_file_type(f) for f in src_files]
+        file_lists = dict.fromkeys(_VLOG_FILE_TYPES, vlog_files)
+        file_lists.update(dict.fromkeys(_C_FILE_TYPES, opt_c_files))
+        file_lists["vlt"] = vlt_files
+        for src_file, file_type in zip(src_files, file_types):
+            file_list = file_lists.get(file_type)
+            if file_list is not None:
+                file_list.append(src_file.name)
+
+        self.render_template(
+            "verilator.vc.j2",
+            self.verilator_file,
+            {
+                "mode": self._resolved_mode(),
+                "libs": self.tool_options.get("libs", []),
+                "incdirs": incdirs,
+                "vlt_files": vlt_files,
+                "vlog_files": vlog_files,
+                "toplevel": self.toplevel,
+                "exe": self._get_bool_opts()["exe"],
+                "opt_c_files": opt_c_files,
+                "vlogparam": self.vlogparam,
+                "vlogdefine": self.vlogdefine,
+            },
+        )
 
         if "verilator_options" in self.tool_options:
             verilator_options = " ".join(self.tool_options["verilator_options"])
@@ -229,49 +193,48 @@ class Verilator(Edatool):
         else:
             make_options = ""
 
-        with open(os.path.join(self.work_root, "config.mk"), "w") as config_mk:
-            config_mk.write(
-                CONFIG_MK_TEMPLATE.format(
-                    top_module=self.toplevel,
-                    vc_file=self.verilator_file,
-                    verilator_options=verilator_options,
-                    make_options=make_options,
-                )
-            )
+        self.render_template("Makefile.j2", "Makefile")
+        self.render_template(
+            "config.mk.j2",
+            "config.mk",
+            {
+                "top_module": self.toplevel,
+                "vc_file": self.verilator_file,
+                "verilator_options": verilator_options,
+                "make_options": make_options,
+            },
+        )
 
     def build_main(self):
         logger.info("Building simulation model")
-        if "mode" not in self.tool_options:
-            self.tool_options["mode"] = "cc"
+        mode = self._resolved_mode()
         args = []
 
-        if self.tool_options["mode"] not in Verilator.modes:
-            _s = "Illegal verilator mode {}. Allowed values are {}"
-            raise RuntimeError(
-                _s.format(self.tool_options["mode"], ", ".join(Verilator.modes))
-            )
-
         # PHONY Makefile targets
-        if self.tool_options["mode"] in [
+        if mode in [
             "binary",
             "dpi-hdr-only",
             "lint-only",
             "preprocess-only",
             "xml-only",
         ]:
-            args.append(self.tool_options["mode"])
+            args.append(mode)
 
         # Build mode
-        if self.tool_options["mode"] != "none":
+        if mode != "none":
             self._run_tool("make", args, quiet=True)
 
-        # Additional builds
-        if str(self.tool_options.get("gen-xml")).lower() == "true":
-            self._run_tool("make", ["xml-only"], quiet=True)
-        if str(self.tool_options.get("gen-dpi-hdr")).lower() == "true":
-            self._run_tool("make", ["dpi-hdr-only"], quiet=True)
-        if str(self.tool_options.get("gen-preprocess")).lower() == "true":
-            self._run_tool("make", ["preprocess-only"], quiet=True)
+        # Additional builds. Each target runs verilator in the same Mdir, so
+        # they get separate make invocations to keep them from overlapping
+        # when MAKEFLAGS enables parallel builds
+        bool_opts = self._get_bool_opts()
+        for opt, target in [
+            ("gen-xml", "xml-only"),
+            ("gen-dpi-hdr", "dpi-hdr-only"),
+            ("gen-preprocess", "preprocess-only"),
+        ]:
+            if bool_opts[opt]:
+                self._run_tool("make", [target], quiet=True)
 
     def run_main(self):
         self.check_managed_parser()
@@ -283,10 +246,7 @@ class Verilator(Edatool):
 
         self.args += self.tool_options.get("run_options", [])
 
-        # Default to cc mode if not specified
-        if "mode" not in self.tool_options:
-            self.tool_options["mode"] = "cc"
-        if self.tool_options["mode"] in [
+        if self._resolved_mode() in [
             "dpi-hdr-only",
             "lint-only",
             "preprocess-only",
@@ -14,7 +14,7 @@ def test_radiant(make_edalize_test):
 
     tf.backend.configure()
 
-    tf.compare_files([name + ".tcl", name + "_run.tcl"])
+    tf.compare_files([name + ".tcl", name + "_run.tcl", name + "_all.tcl"])
 
     tf.backend.build()
 
@@ -50,6 +50,7 @@ def test_radiant_minimal(tmpdir):
         [
             name + ".tcl",
             name + "_run.tcl",
+            name + "_all.tcl",
         ],
     )
 
@@ -1,2 +1 @@
-test_radiant_minimal_0.tcl
-test_radiant_minimal_0_run.tcl
+test_radiant_minimal_0_all.tcl
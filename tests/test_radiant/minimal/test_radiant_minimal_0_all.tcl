@@ -0,0 +1,3 @@
+#Generated by Edalize
+source {test_radiant_minimal_0.tcl}
+source {test_radiant_minimal_0_run.tcl}
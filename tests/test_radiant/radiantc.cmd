@@ -1,2 +1 @@
-test_radiant_0.tcl
-test_radiant_0_run.tcl
+test_radiant_0_all.tcl
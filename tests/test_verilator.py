@@ -1,3 +1,5 @@
+import pytest
+
 from .edalize_common import make_edalize_test
 
 
@@ -84,3 +86,83 @@ def test_verilator_xml_only(make_edalize_test):
 
     tf.compare_files(["Makefile"])
     tf.compare_files(["config.mk", tf.test_name + ".vc"], ref_subdir=mode)
+
+
+def test_verilator_versioned_file_types(make_edalize_test):
+    files = [
+        {"name": "sv_file.sv", "file_type": "systemVerilogSource-2012"},
+        {"name": "vlog05_file.v", "file_type": "verilogSource-2005"},
+        {"name": "c_file.c", "file_type": "cSource-99"},
+        {"name": "cpp_file.cpp", "file_type": "cppSource-11"},
+        {"name": "sc_file.cpp", "file_type": "systemCSource-2.3"},
+        {"name": "user_file", "file_type": "user"},
+    ]
+    tf = make_edalize_test(
+        "verilator", param_types=[], files=files, tool_options={"mode": "cc"}
+    )
+
+    tf.backend.configure()
+
+    tf.compare_files([tf.test_name + ".vc"], ref_subdir="versioned")
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        ({"mode": "cc"}, [[]]),
+        ({"mode": "lint-only"}, [["lint-only"]]),
+        ({"mode": "none"}, []),
+        ({"mode": "cc", "gen-xml": True}, [[], ["xml-only"]]),
+        (
+            {"mode": "binary", "gen-dpi-hdr": "true", "gen-preprocess": "True"},
+            [["binary"], ["dpi-hdr-only"], ["preprocess-only"]],
+        ),
+        (
+            {
+                "mode": "none",
+                "gen-xml": "true",
+                "gen-dpi-hdr": True,
+                "gen-preprocess": True,
+            },
+            [["xml-only"], ["dpi-hdr-only"], ["preprocess-only"]],
+        ),
+        ({"mode": "cc", "gen-xml": "false", "gen-preprocess": False}, [[]]),
+    ],
+)
+def test_verilator_build(params, make_edalize_test):
+    tool_options, expected = params
+    tf = make_edalize_test("verilator", param_types=[], tool_options=tool_options)
+
+    calls = []
+
+    def _run_tool(cmd, args=[], quiet=False):
+        calls.append((cmd, args))
+        return 0, None, None
+
+    tf.backend._run_tool = _run_tool
+    tf.backend.build()
+
+    assert calls == [("make", args) for args in expected]
+
+
+def test_verilator_illegal_mode(make_edalize_test):
+    tf = make_edalize_test("verilator", param_types=[], tool_options={"mode": "bad"})
+
+    with pytest.raises(RuntimeError) as e:
+        tf.backend.build()
+    assert "Illegal verilator mode bad" in str(e.value)
+
+    tf = make_edalize_test("verilator", param_types=[], tool_options={"mode": "bad"})
+
+    with pytest.raises(RuntimeError) as e:
+        tf.backend.run()
+    assert "Illegal verilator mode bad" in str(e.value)
+
+
+def test_verilator_default_mode(make_edalize_test):
+    tf = make_edalize_test("verilator", param_types=[])
+
+    tf.backend.configure()
+
+    assert tf.backend.tool_options["mode"] == "cc"
+    tf.compare_files([tf.test_name + ".vc"], ref_subdir="cc-default")
@@ -4,3 +4,4 @@ TOP_MODULE        := top_module
 VC_FILE           := test_verilator_0.vc
 VERILATOR_OPTIONS := 
 MAKE_OPTIONS      := 
+MAKE_JOBS         ?= $(shell nproc 2>/dev/null || echo 4)